@@ -1,11 +1,47 @@
 import argparse
+from collections import deque
 import os
+import posixpath
 from pathlib import Path
 import tkinter as tk
 from tkinter import scrolledtext, Entry, Frame, Label
 import re
 import sys
 
+# Разбивка командной строки на аргументы с учетом кавычек:
+# группы захватывают содержимое кавычек либо аргумент без кавычек целиком
+_ARG_RE = re.compile(r'\"([^\"]*)\"|\'([^\']*)\'|(\S+)')
+
+# Сколько последних команд хранит история GUI
+_HISTORY_LIMIT = 1000
+
+_HELP_TEXT = """
+Доступные команды:
+- ls - список файлов и директорий
+- cd [путь] - сменить директорию  
+- pwd - текущая директория
+- mkdir [имя] - создать директорию
+- touch [имя] - создать файл
+- echo [текст] - вывести текст
+- cat [имя] - прочитать файл
+- help - справка
+- exit - выход
+"""
+
+_WELCOME_MSG = """Добро пожаловать в VFS Emulator v1.0
+        Доступные команды: ls, cd, exit
+
+        Для справки по конкретной команде используйте: команда --help
+
+        """
+
+_CONFIG_TEMPLATE = (
+    "=== Конфигурация эмулятора VFS ===Путь к VFS: {vfs_path}\n"
+    "        Стартовый скрипт: {script}\n"
+    "        " + "=" * 40 + "\n"
+    "        "
+)
+
 def parse_command_line_args():
     """Парсинг аргументов командной строки"""
     parser = argparse.ArgumentParser(description='VFS Emulator')
@@ -14,133 +50,121 @@ def parse_command_line_args():
     return parser.parse_args()
 
 def execute_startup_script(vfs, script_path):
-    """Выполняет стартовый скрипт с отладочным выводом"""
+    """Выполняет стартовый скрипт с отладочным выводом.
+
+    Генератор: выдает вывод по одной команде, чтобы GUI мог отображать
+    результаты по мере выполнения, не накапливая весь вывод в памяти.
+    Сам скрипт читается целиком - стартовые скрипты невелики.
+    """
     script_file = Path(script_path)
     
     if not script_file.exists():
-        return f"Ошибка: Скрипт {script_path} не найден\n"
+        yield f"Ошибка: Скрипт {script_path} не найден\n"
+        return
     
-    output = []
-    output.append(f"=== Выполнение стартового скрипта: {script_path} ===\n")
+    yield f"=== Выполнение стартового скрипта: {script_path} ===\n"
     
-    with open(script_path, 'r', encoding='utf-8') as file:
-        for line_num, line in enumerate(file, 1):
-            command = line.strip()
-            if command and not command.startswith('#'):  # Пропускаем пустые строки и комментарии
-                output.append(f"[Скрипт строка {line_num}] > {command}\n")
-                result = vfs.execute_command(command)
-                if result and result != "EXIT":
-                    output.append(result)
-                elif result == "EXIT":
-                    output.append("Завершение работы по скрипту\n")
-                    break
-                output.append("\n")  # Пустая строка для разделения
+    # Скрипт читается за один вызов; пустые строки и комментарии
+    # отбрасываются до основного цикла, номера строк сохраняются
+    lines = script_file.read_text(encoding='utf-8').splitlines()
+    commands = [
+        (line_num, command)
+        for line_num, command in enumerate((line.strip() for line in lines), 1)
+        if command and not command.startswith('#')
+    ]
     
-    return "".join(output)
+    for line_num, command in commands:
+        echo = f"[Скрипт строка {line_num}] > {command}\n"
+        result = vfs.execute_command(command)
+        if result == "EXIT":
+            yield echo + "Завершение работы по скрипту\n"
+            break
+        yield echo + result + "\n"  # Пустая строка для разделения
 
 class VFSEmulator:
+    __slots__ = ('current_dir', 'vfs_path')
+    
     def __init__(self, vfs_path=None):
         self.current_dir = "/home/user"
         self.vfs_path = Path(vfs_path) if vfs_path else None
         if self.vfs_path:
             self.vfs_path.mkdir(parents=True, exist_ok=True)
-        
-        self.commands = {
-            "ls": self.ls_command,
-            "cd": self.cd_command,
-            "exit": self.exit_command,
-            "pwd": self.pwd_command,
-            "mkdir": self.mkdir_command,
-            "touch": self.touch_command,
-            "echo": self.echo_command,
-            "cat": self.cat_command,
-            "help": self.help_command
-        }
     
     def parse_arguments(self, command_line):
         """Парсер аргументов с поддержкой кавычек"""
-        # Регулярное выражение для разбивки с учетом кавычек
-        pattern = r'\"[^\"]*\"|\'[^\']*\'|\S+'
-        matches = re.findall(pattern, command_line)
-        
-        # Убираем кавычки вокруг аргументов
-        cleaned_args = []
-        for match in matches:
-            if (match.startswith('"') and match.endswith('"')) or \
-               (match.startswith("'") and match.endswith("'")):
-                cleaned_args.append(match[1:-1])
-            else:
-                cleaned_args.append(match)
-        
-        return cleaned_args
+        # Без кавычек достаточно обычного разбиения по пробелам
+        if '"' not in command_line and "'" not in command_line:
+            return command_line.split()
+        return [dq or sq or bare for dq, sq, bare in _ARG_RE.findall(command_line)]
     
     def execute_command(self, command_line):
         """Выполнение команды"""
-        if not command_line.strip():
+        # Для диспетчеризации достаточно первого слова; остальную строку
+        # разбираем только если команда найдена и у нее есть аргументы
+        parts = command_line.split(None, 1)
+        if not parts:
             return ""
         
-        args = self.parse_arguments(command_line)
-        command = args[0] if args else ""
-        
-        if command in self.commands:
-            return self.commands[command](args[1:])
+        command = parts[0]
+        if command[0] in '"\'':
+            # Имя команды в кавычках - разбираем строку целиком
+            args = self.parse_arguments(command_line)
+            command, rest_args = args[0], args[1:]
         else:
+            rest_args = None
+        
+        # Интернированное имя сравнивается с ключами таблицы по идентичности
+        command = sys.intern(command)
+        handler = _COMMANDS.get(command)
+        if handler is None:
             return f"vfs: команда не найдена: {command}\n"
+        
+        if rest_args is None:
+            rest_args = self.parse_arguments(parts[1]) if len(parts) > 1 else []
+        return handler(self, rest_args)
     
     def ls_command(self, args):
         """Заглушка команды ls"""
         return f"ls: аргументы {args} (текущая директория: {self.current_dir})\n"
 
-        def pwd_command(self, args):
-    """Команда pwd"""
-    return f"{self.current_dir}\n"
+    def pwd_command(self, args):
+        """Команда pwd"""
+        return f"{self.current_dir}\n"
 
-def mkdir_command(self, args):
-    """Команда mkdir"""
-    if len(args) == 0:
-        return "mkdir: отсутствует операнд\n"
+    def mkdir_command(self, args):
+        """Команда mkdir"""
+        if len(args) == 0:
+            return "mkdir: отсутствует операнд\n"
     
-    dir_name = args[0]
-    # Здесь должна быть логика создания реальной директории в VFS
-    return f"mkdir: создана директория '{dir_name}'\n"
+        dir_name = args[0]
+        # Здесь должна быть логика создания реальной директории в VFS
+        return f"mkdir: создана директория '{dir_name}'\n"
 
-def touch_command(self, args):
-    """Команда touch"""
-    if len(args) == 0:
-        return "touch: отсутствует операнд\n"
+    def touch_command(self, args):
+        """Команда touch"""
+        if len(args) == 0:
+            return "touch: отсутствует операнд\n"
     
-    file_name = args[0]
-    # Здесь должна быть логика создания реального файла в VFS
-    return f"touch: создан файл '{file_name}'\n"
+        file_name = args[0]
+        # Здесь должна быть логика создания реального файла в VFS
+        return f"touch: создан файл '{file_name}'\n"
 
-def echo_command(self, args):
-    """Команда echo"""
-    return " ".join(args) + "\n"
+    def echo_command(self, args):
+        """Команда echo"""
+        return " ".join(args) + "\n"
 
-def cat_command(self, args):
-    """Команда cat"""
-    if len(args) == 0:
-        return "cat: отсутствует операнд\n"
+    def cat_command(self, args):
+        """Команда cat"""
+        if len(args) == 0:
+            return "cat: отсутствует операнд\n"
     
-    file_name = args[0]
-    # Здесь должна быть логика чтения реального файла из VFS
-    return f"cat: содержимое файла '{file_name}'\n"
+        file_name = args[0]
+        # Здесь должна быть логика чтения реального файла из VFS
+        return f"cat: содержимое файла '{file_name}'\n"
 
-def help_command(self, args):
-    """Команда help"""
-    help_text = """
-Доступные команды:
-- ls - список файлов и директорий
-- cd [путь] - сменить директорию  
-- pwd - текущая директория
-- mkdir [имя] - создать директорию
-- touch [имя] - создать файл
-- echo [текст] - вывести текст
-- cat [имя] - прочитать файл
-- help - справка
-- exit - выход
-"""
-    return help_text
+    def help_command(self, args):
+        """Команда help"""
+        return _HELP_TEXT
     
     def cd_command(self, args):
         """Заглушка команды cd"""
@@ -149,17 +173,10 @@ def help_command(self, args):
             self.current_dir = "/home/user"
             return ""
         elif len(args) == 1:
-            new_dir = args[0]
-            # Простая имитация изменения директории
-            if new_dir == "..":
-                # Упрощенная логика для родительской директории
-                if self.current_dir != "/":
-                    parts = self.current_dir.rstrip('/').split('/')
-                    self.current_dir = '/'.join(parts[:-1]) if len(parts) > 1 else "/"
-            elif new_dir.startswith("/"):
-                self.current_dir = new_dir
-            else:
-                self.current_dir = f"{self.current_dir.rstrip('/')}/{new_dir}"
+            # Абсолютный путь заменяет текущий при join, а normpath
+            # за один вызов разворачивает "..", "." и лишние слэши
+            target = posixpath.join(self.current_dir, args[0])
+            self.current_dir = posixpath.normpath(target)
             
             return f"cd: изменена директория на {self.current_dir}\n"
         else:
@@ -169,6 +186,19 @@ def help_command(self, args):
         """Команда exit"""
         return "EXIT"
 
+# Таблица команд: общая для всех экземпляров, хранит несвязанные методы
+_COMMANDS = {
+    "ls": VFSEmulator.ls_command,
+    "cd": VFSEmulator.cd_command,
+    "exit": VFSEmulator.exit_command,
+    "pwd": VFSEmulator.pwd_command,
+    "mkdir": VFSEmulator.mkdir_command,
+    "touch": VFSEmulator.touch_command,
+    "echo": VFSEmulator.echo_command,
+    "cat": VFSEmulator.cat_command,
+    "help": VFSEmulator.help_command
+}
+
 class VFSGUI:
     def __init__(self, root, vfs_path=None, script_path=None):
         self.root = root
@@ -179,6 +209,9 @@ class VFSGUI:
         self.vfs = VFSEmulator(vfs_path)
         self.script_path = script_path
         
+        # Директория, для которой построено текущее приглашение
+        self._last_prompt_dir = self.vfs.current_dir
+        
         # Создание интерфейса
         self.create_widgets()
         
@@ -208,6 +241,11 @@ class VFSGUI:
         self.text_area.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         self.text_area.config(state=tk.DISABLED)
         
+        # Связанные методы виджетов для горячего пути вывода и ввода
+        self._ta_insert = self.text_area.insert
+        self._ta_see = self.text_area.see
+        self._ta_config = self.text_area.config
+        
         # Фрейм для ввода команды
         input_frame = Frame(self.root, bg='black')
         input_frame.pack(fill=tk.X, padx=5, pady=5)
@@ -235,45 +273,56 @@ class VFSGUI:
         self.entry.bind('<Return>', self.execute_command)
         self.entry.bind('<Up>', self.command_history_up)
         self.entry.bind('<Down>', self.command_history_down)
+        self._entry_get = self.entry.get
+        self._entry_delete = self.entry.delete
+        self._entry_insert = self.entry.insert
         
-        # История команд
-        self.command_history = []
+        # История команд: старые записи вытесняются автоматически
+        self.command_history = deque(maxlen=_HISTORY_LIMIT)
         self.history_index = -1
         
     def display_welcome(self):
         """Отображение приветственного сообщения"""
-        welcome_msg = """Добро пожаловать в VFS Emulator v1.0
-        Доступные команды: ls, cd, exit
-
-        Для справки по конкретной команде используйте: команда --help
-
-        """
-        self.display_output(welcome_msg)
+        self.display_output(_WELCOME_MSG)
         self.update_prompt()
     
     def update_prompt(self):
         """Обновление приглашения командной строки"""
-        self.prompt_label.config(text=f"vfs:{self.vfs.current_dir}$ ")
+        current_dir = self.vfs.current_dir
+        if current_dir == self._last_prompt_dir:
+            return
+        self._last_prompt_dir = current_dir
+        self.prompt_label.config(text=f"vfs:{current_dir}$ ")
     
     def display_output(self, text):
         """Отображение вывода в текстовой области"""
-        self.text_area.config(state=tk.NORMAL)
-        self.text_area.insert(tk.END, text)
-        self.text_area.see(tk.END)
-        self.text_area.config(state=tk.DISABLED)
+        self._ta_config(state=tk.NORMAL)
+        self._ta_insert(tk.END, text)
+        self._ta_see(tk.END)
+        self._ta_config(state=tk.DISABLED)
+    
+    def display_output_many(self, parts):
+        """Отображение нескольких фрагментов вывода за одно переключение состояния"""
+        insert = self._ta_insert
+        self._ta_config(state=tk.NORMAL)
+        for part in parts:
+            if part:
+                insert(tk.END, part)
+        self._ta_see(tk.END)
+        self._ta_config(state=tk.DISABLED)
     
     def execute_command(self, event=None):
         """Выполнение команды"""
-        command = self.entry.get().strip()
-        self.entry.delete(0, tk.END)
+        command = self._entry_get().strip()
+        self._entry_delete(0, tk.END)
         
         if command:
             # Добавляем команду в историю
             self.command_history.append(command)
             self.history_index = len(self.command_history)
             
-            # Отображаем команду
-            self.display_output(f"vfs:{self.vfs.current_dir}$ {command}\n")
+            # Запоминаем строку с командой до выполнения (cd меняет директорию)
+            echo = f"vfs:{self.vfs.current_dir}$ {command}\n"
             
             # Выполняем команду
             result = self.vfs.execute_command(command)
@@ -282,8 +331,8 @@ class VFSGUI:
                 self.root.quit()
                 return
             
-            # Отображаем результат
-            self.display_output(result)
+            # Отображаем команду и результат за один цикл обновления виджета
+            self.display_output_many((echo, result))
             
             # Обновляем приглашение (особенно важно для cd)
             self.update_prompt()
@@ -292,33 +341,43 @@ class VFSGUI:
         """Переход к предыдущей команде в истории"""
         if self.command_history and self.history_index > 0:
             self.history_index -= 1
-            self.entry.delete(0, tk.END)
-            self.entry.insert(0, self.command_history[self.history_index])
+            self._entry_delete(0, tk.END)
+            self._entry_insert(0, self.command_history[self.history_index])
     
     def command_history_down(self, event):
         """Переход к следующей команде в истории"""
         if self.command_history and self.history_index < len(self.command_history) - 1:
             self.history_index += 1
-            self.entry.delete(0, tk.END)
-            self.entry.insert(0, self.command_history[self.history_index])
+            self._entry_delete(0, tk.END)
+            self._entry_insert(0, self.command_history[self.history_index])
         elif self.history_index == len(self.command_history) - 1:
             self.history_index = len(self.command_history)
-            self.entry.delete(0, tk.END)
+            self._entry_delete(0, tk.END)
 
     def display_configuration(self, vfs_path, script_path):
         """Отладочный вывод конфигурации"""
-        config_msg = f"""=== Конфигурация эмулятора VFS ===Путь к VFS: {vfs_path}
-        Стартовый скрипт: {script_path if script_path else 'Не указан'}
-        {"=" * 40}
-        """
-    self.display_output(config_msg)
+        config_msg = _CONFIG_TEMPLATE.format(
+            vfs_path=vfs_path,
+            script=script_path if script_path else 'Не указан'
+        )
+        self.display_output(config_msg)
 
-def execute_startup_script(self):
-    """Выполнение стартового скрипта"""
-    if self.script_path:
-        result = execute_startup_script(self.vfs, self.script_path)
-        self.display_output(result)
+    def execute_startup_script(self):
+        """Выполнение стартового скрипта"""
+        if self.script_path:
+            self.root.after_idle(
+                self._pump_startup_script,
+                execute_startup_script(self.vfs, self.script_path)
+            )
+    
+    def _pump_startup_script(self, chunks):
+        """Отображает очередную порцию вывода скрипта и планирует следующую"""
+        chunk = next(chunks, None)
+        if chunk is None:
+            return
+        self.display_output(chunk)
         self.update_prompt()
+        self.root.after_idle(self._pump_startup_script, chunks)
 
 def main():
     # Парсинг аргументов командной строки
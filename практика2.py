@@ -1,84 +1,294 @@
 import argparse
 import sys
 import os
-from typing import Dict, Any, List, Optional, Set, Tuple
+import stat
+import json
+from pathlib import Path
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Set, Tuple
 from collections import deque
-import re
-import urllib.request
-import urllib.error
-from xml.etree import ElementTree as ET
-import gzip
-import tempfile
+import io
+import zlib
+
+# Парсер аргументов строится один раз при импорте модуля
+_PARSER = argparse.ArgumentParser(
+    description='Визуализатор графа зависимостей пакетов Alpine Linux',
+    formatter_class=argparse.RawDescriptionHelpFormatter
+)
+
+_PARSER.add_argument(
+    '--package',
+    type=str,
+    required=True,
+    help='Имя анализируемого пакета'
+)
+
+_PARSER.add_argument(
+    '--repository',
+    type=str,
+    required=True,
+    help='URL-адрес репозитория или путь к файлу тестового репозитория'
+)
+
+_PARSER.add_argument(
+    '--test-mode',
+    action='store_true',
+    help='Режим работы с тестового репозитория'
+)
+
+_PARSER.add_argument(
+    '--version',
+    type=str,
+    default='latest',
+    help='Версия пакета (по умолчанию: latest)'
+)
+
+_PARSER.add_argument(
+    '--ascii-tree',
+    action='store_true',
+    help='Режим вывода зависимостей в формате ASCII-дерева'
+)
+
+_PARSER.add_argument(
+    '--filter',
+    type=str,
+    default='',
+    help='Подстрока для фильтрации пакетов'
+)
+
+_PARSER.add_argument(
+    '--max-depth',
+    type=int,
+    default=3,
+    help='Максимальная глубина рекурсии для построения дерева'
+)
+
+# Каталог кэша загруженных индексов репозиториев
+_CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'ky'
+
+# Таблица, помечающая байтом 0x01 символы начала ограничения версии
+_VER_MARK_TABLE = bytes.maketrans(b'<=>', b'\x01\x01\x01')
+
+# Размер блока и буфера чтения данных репозитория
+_READ_CHUNK_SIZE = 128 * 1024
+
+# Разделитель блока конфигурации
+_CONFIG_SEP = "-" * 30
+
+# Разделитель списка зависимостей
+_DEPS_SEP = "-" * 40
+
+# Замена символов, недопустимых в идентификаторах Graphviz, за один проход
+_DOT_ID_TABLE = str.maketrans('-.', '__')
+
+
+def _apkindex_package(current_package, value: bytes, packages: Dict[str, Dict]) -> Dict:
+    """P: - начало записи нового пакета"""
+    # Имена интернируются: одно и то же имя встречается во многих D:-полях
+    package = {'name': sys.intern(value.decode('utf-8')), 'dependencies': set(), 'version': ''}
+    packages[package['name']] = package
+    return package
+
+
+def _apkindex_version(current_package, value: bytes, packages: Dict[str, Dict]):
+    """V: - версия текущего пакета"""
+    if current_package:
+        current_package['version'] = value.decode('utf-8')
+    return current_package
+
+
+def _apkindex_depends(current_package, value: bytes, packages: Dict[str, Dict]):
+    """D: - зависимости текущего пакета"""
+    if not current_package:
+        return current_package
+    
+    dependencies = current_package['dependencies']
+    for dep in value.split():
+        # Зависимости от разделяемых библиотек (so:...) не являются именами
+        # пакетов - отбрасываем их до разбора версии
+        if dep.startswith(b'so:'):
+            continue
+        # Убираем версии из зависимостей: обрезаем по первому из <, =, >,
+        # найденному одним проходом translate + find по байтам
+        end = dep.translate(_VER_MARK_TABLE).find(b'\x01')
+        clean_dep = dep if end < 0 else dep[:end]
+        if clean_dep:
+            dependencies.add(sys.intern(clean_dep.decode('utf-8')))
+    return current_package
+
+
+# Обработчики полей APKINDEX по ключу (часть строки до ':')
+_APKINDEX_HANDLERS = {
+    b'P': _apkindex_package,
+    b'V': _apkindex_version,
+    b'D': _apkindex_depends,
+}
+
 
 class DependencyCollector:
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.dependencies_cache = {}
+        # Разобранный APKINDEX: загружается один раз на весь запуск
+        self._packages: Optional[Dict[str, Dict]] = None
     
-    def fetch_repository_data(self) -> str:
-        """Получение данных из репозитория"""
+    def fetch_repository_data(self) -> Iterator[bytes]:
+        """Построчное получение данных из репозитория (строки в байтах)"""
         repository = self.config['repository']
         
         if self.config['test_mode']:
             # Работа с локальным файлом
             try:
-                with open(repository, 'r', encoding='utf-8') as f:
-                    return f.read()
+                with open(repository, 'rb', buffering=_READ_CHUNK_SIZE) as f:
+                    yield from f
             except Exception as e:
                 raise Exception(f"Ошибка чтения файла репозитория: {e}")
         else:
-            # Работа с URL
+            # Сетевой стек импортируется только когда нужен (не для --help
+            # и не для тестового режима)
+            import urllib.request
+            import urllib.error
+            
+            # Работа с URL: условный запрос по сохраненным ETag / Last-Modified
+            data_path, meta_path = self.cache_paths(repository)
+            headers = self.cache_validators(data_path, meta_path)
+            headers['Accept-Encoding'] = 'gzip'
+            request = urllib.request.Request(repository, headers=headers)
             try:
-                with urllib.request.urlopen(repository) as response:
-                    content = response.read()
-                    
-                    # Обработка gzip сжатия
-                    if repository.endswith('.gz'):
-                        with gzip.open(tempfile.TemporaryFile(), 'w') as f:
-                            f.write(content)
-                            f.seek(0)
-                            return f.read().decode('utf-8')
+                try:
+                    response = urllib.request.urlopen(request)
+                except urllib.error.HTTPError as e:
+                    if e.code != 304:
+                        raise
+                    e.close()
+                    # 304 Not Modified: читаем распакованную копию из кэша
+                    with open(data_path, 'rb', buffering=_READ_CHUNK_SIZE) as f:
+                        yield from f
+                    return
+                
+                with response:
+                    # Обработка gzip сжатия (файл .gz или сжатие при передаче):
+                    # распаковка на лету, по строкам
+                    encoding = response.headers.get('Content-Encoding', '')
+                    if repository.endswith('.gz') or encoding.lower() == 'gzip':
+                        lines = self.iter_gzip_lines(response)
                     else:
-                        return content.decode('utf-8')
+                        # Построчное чтение поверх буфера 128 КиБ вместо 8 КиБ
+                        lines = io.BufferedReader(response, buffer_size=_READ_CHUNK_SIZE)
+                    yield from self.iter_caching_lines(lines, response.headers, data_path, meta_path)
                         
             except urllib.error.URLError as e:
                 raise Exception(f"Ошибка доступа к репозиторию: {e}")
             except Exception as e:
                 raise Exception(f"Ошибка обработки данных репозитория: {e}")
     
-    def parse_apkindex(self, content: str) -> Dict[str, Dict]:
-        """Парсинг APKINDEX"""
+    def cache_paths(self, repository: str) -> Tuple[Path, Path]:
+        """Пути к кэшу распакованного индекса и его метаданных для URL"""
+        import hashlib
+        
+        key = hashlib.sha256(repository.encode('utf-8')).hexdigest()
+        return _CACHE_DIR / f"{key}.apkindex", _CACHE_DIR / f"{key}.meta"
+    
+    def cache_validators(self, data_path: Path, meta_path: Path) -> Dict[str, str]:
+        """Заголовки условного запроса по сохраненным ETag / Last-Modified"""
+        if not data_path.is_file():
+            return {}
+        try:
+            meta = json.loads(meta_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+        
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+    
+    def iter_caching_lines(self, lines: Iterable[bytes], response_headers,
+                           data_path: Path, meta_path: Path) -> Iterator[bytes]:
+        """Выдает строки индекса, попутно сохраняя их в кэш"""
+        meta = {
+            'etag': response_headers.get('ETag'),
+            'last_modified': response_headers.get('Last-Modified'),
+        }
+        if not (meta['etag'] or meta['last_modified']):
+            # Без валидаторов повторный запрос все равно будет полным
+            yield from lines
+            return
+        
+        tmp_path = data_path.with_suffix('.tmp')
+        try:
+            data_path.parent.mkdir(parents=True, exist_ok=True)
+            out = open(tmp_path, 'wb')
+        except OSError:
+            # Кэш недоступен - просто работаем без него
+            yield from lines
+            return
+        
+        complete = False
+        try:
+            with out:
+                for line in lines:
+                    out.write(line)
+                    if not line.endswith(b'\n'):
+                        out.write(b'\n')
+                    yield line
+            complete = True
+        finally:
+            try:
+                if complete:
+                    # Сначала данные, потом метаданные: иначе устаревшая
+                    # копия могла бы получить новый ETag
+                    os.replace(tmp_path, data_path)
+                    meta_path.write_text(json.dumps(meta), encoding='utf-8')
+                else:
+                    os.remove(tmp_path)
+            except OSError:
+                pass
+    
+    def iter_gzip_lines(self, stream) -> Iterator[bytes]:
+        """Потоковая распаковка gzip блоками по 128 КиБ с выдачей строк"""
+        decompressor = zlib.decompressobj(wbits=31)
+        pending = b''
+        
+        for chunk in iter(lambda: stream.read(_READ_CHUNK_SIZE), b''):
+            data = decompressor.decompress(chunk)
+            # APKINDEX.tar.gz состоит из нескольких gzip-потоков подряд
+            while decompressor.eof and decompressor.unused_data:
+                rest = decompressor.unused_data
+                decompressor = zlib.decompressobj(wbits=31)
+                data += decompressor.decompress(rest)
+            
+            lines = (pending + data).split(b'\n')
+            pending = lines.pop()
+            yield from lines
+        
+        pending += decompressor.flush()
+        if pending:
+            yield from pending.split(b'\n')
+    
+    def parse_apkindex(self, lines: Iterable[bytes]) -> Dict[str, Dict]:
+        """Потоковый парсинг APKINDEX: декодируются только нужные поля"""
         packages = {}
         current_package = None
         
-        for line in content.split('\n'):
-            line = line.strip()
-            
-            if line.startswith('P:'):
-                # Начало нового пакета
-                if current_package:
-                    packages[current_package['name']] = current_package
-                current_package = {'name': line[2:], 'dependencies': [], 'version': ''}
-            
-            elif line.startswith('V:') and current_package:
-                current_package['version'] = line[2:]
-            
-            elif line.startswith('D:') and current_package:
-                # Зависимости
-                deps = line[2:].split()
-                for dep in deps:
-                    if dep and dep != 'so:':
-                        # Убираем версии из зависимостей
-                        clean_dep = re.sub(r'[<=>].*', '', dep)
-                        if clean_dep and clean_dep not in current_package['dependencies']:
-                            current_package['dependencies'].append(clean_dep)
-        
-        # Добавляем последний пакет
-        if current_package:
-            packages[current_package['name']] = current_package
+        for raw in lines:
+            # Одно разбиение строки и один поиск обработчика по ключу поля
+            key, sep, value = raw.strip().partition(b':')
+            if not sep:
+                continue
+            handler = _APKINDEX_HANDLERS.get(key)
+            if handler is not None:
+                current_package = handler(current_package, value, packages)
         
         return packages
     
+    def get_packages(self) -> Dict[str, Dict]:
+        """Разобранный индекс репозитория (загружается при первом обращении)"""
+        if self._packages is None:
+            self._packages = self.parse_apkindex(self.fetch_repository_data())
+        return self._packages
+    
     def get_package_dependencies(self, package_name: str, version: str = 'latest') -> List[str]:
         """Получение зависимостей для конкретного пакета"""
         cache_key = f"{package_name}_{version}"
@@ -87,22 +297,21 @@ class DependencyCollector:
         
         try:
             # Получаем данные репозитория
-            repo_data = self.fetch_repository_data()
-            packages = self.parse_apkindex(repo_data)
+            packages = self.get_packages()
             
-            # Ищем нужный пакет
+            # Ищем нужный пакет: индекс уже построен по имени
             target_package = None
-            for pkg_name, pkg_info in packages.items():
-                if pkg_name == package_name:
-                    if version == 'latest' or pkg_info['version'] == version:
-                        target_package = pkg_info
-                        break
+            pkg_info = packages.get(package_name)
+            if pkg_info and (version == 'latest' or pkg_info['version'] == version):
+                target_package = pkg_info
             
             if not target_package:
                 raise Exception(f"Пакет {package_name} версии {version} не найден")
             
+            # Множество зависимостей превращаем в упорядоченный список один раз
+            dependencies = sorted(target_package['dependencies'])
+            
             # Применяем фильтр если задан
-            dependencies = target_package['dependencies']
             if self.config['filter']:
                 dependencies = [dep for dep in dependencies 
                               if self.config['filter'] in dep]
@@ -125,11 +334,11 @@ class DependencyCollector:
             
             dependencies = self.get_package_dependencies(package_name, version)
             
-            print(f"\nПрямые зависимости пакета {package_name}:")
-            print("-" * 40)
-            for dep in dependencies:
-                print(f"  - {dep}")
-            print("-" * 40)
+            # Весь список выводится одной записью, а не print на каждую строку
+            lines = [f"\nПрямые зависимости пакета {package_name}:", _DEPS_SEP]
+            lines.extend(f"  - {dep}" for dep in dependencies)
+            lines.append(_DEPS_SEP)
+            sys.stdout.write("\n".join(lines) + "\n")
             
             print(f"Всего зависимостей: {len(dependencies)}")
             
@@ -141,85 +350,161 @@ class DependencyCollector:
 class DependencyGraph:
     def __init__(self, collector: 'DependencyCollector'):
         self.collector = collector
-        self.graph = {}
-        self.visited = set()
+        # Граф в виде параллельных массивов, индекс - целочисленный id пакета
+        self.name_to_id: Dict[str, int] = {}
+        self.names: List[str] = []
+        # id зависимостей пакета; None - зависимости еще не загружены
+        self.children: List[Optional[List[int]]] = []
+    
+    def node_id(self, package: str) -> int:
+        """id пакета в массивах графа (новый пакет добавляется в конец)"""
+        node = self.name_to_id.get(package)
+        if node is None:
+            node = self.name_to_id[package] = len(self.names)
+            self.names.append(package)
+            self.children.append(None)
+        return node
+    
+    def expand(self, node: int) -> List[int]:
+        """Загрузка зависимостей пакета (один раз на пакет)"""
+        kids = self.children[node]
+        if kids is None:
+            try:
+                dependencies = self.collector.get_package_dependencies(self.names[node])
+            except Exception:
+                dependencies = []
+            node_id = self.node_id
+            kids = self.children[node] = [node_id(dep) for dep in dependencies]
+        return kids
     
     def build_dependency_tree(self, package: str, depth: int = 0, max_depth: int = 10) -> Dict:
-        """Рекурсивное построение дерева зависимостей"""
-        if depth > max_depth or package in self.visited:
-            return {'name': package, 'children': []}
-        
-        self.visited.add(package)
-        
-        try:
-            dependencies = self.collector.get_package_dependencies(package)
-            children = []
-            
-            for dep in dependencies:
-                child_tree = self.build_dependency_tree(dep, depth + 1, max_depth)
-                children.append(child_tree)
+        """Построение дерева зависимостей: загрузка пакетов до заданной глубины"""
+        # Зависимости пакета не зависят от корня, поэтому дерево - это корень
+        # и глубина поверх общих массивов; каждый пакет раскрывается один раз,
+        # на минимальной глубине обходом в ширину
+        limit = max_depth - depth
+        root = self.node_id(package)
+        seen = {root}
+        queue = deque([(root, 0)])
+        
+        while queue:
+            node, node_depth = queue.popleft()
+            if node_depth > limit:
+                continue
             
-            return {'name': package, 'children': children}
-            
-        except Exception:
-            return {'name': package, 'children': []}
+            for child in self.expand(node):
+                if child not in seen:
+                    seen.add(child)
+                    queue.append((child, node_depth + 1))
+        
+        return {'root': root, 'max_depth': limit}
     
     def generate_ascii_tree(self, tree: Dict, prefix: str = "", is_last: bool = True) -> str:
-        """Генерация ASCII-дерева"""
+        """Генерация ASCII-дерева (обход с явным стеком, одна склейка в конце)"""
         if not tree:
             return ""
         
-        result = []
-        connector = "└── " if is_last else "├── "
-        result.append(prefix + connector + tree['name'])
-        
-        new_prefix = prefix + ("    " if is_last else "│   ")
-        
-        children = tree['children']
-        for i, child in enumerate(children):
-            is_last_child = i == len(children) - 1
-            result.append(self.generate_ascii_tree(child, new_prefix, is_last_child))
-        
-        return "\n".join(result)
-    
-    def generate_graphviz(self, tree: Dict) -> str:
-        """Генерация кода Graphviz"""
-        nodes = set()
-        edges = set()
-        
-        def traverse(t: Dict, parent: str = None):
-            node_name = t['name'].replace('-', '_').replace('.', '_')
-            nodes.add(node_name)
+        names = self.names
+        children = self.children
+        max_depth = tree['max_depth']
+        lines = []
+        # Пакеты на текущем пути от корня: защита от циклов
+        path = []
+        stack = [(tree['root'], prefix, is_last, 0)]
+        
+        while stack:
+            node, node_prefix, node_is_last, depth = stack.pop()
+            del path[depth:]
+            connector = "└── " if node_is_last else "├── "
+            lines.append(node_prefix + connector + names[node])
             
-            if parent:
-                edges.add(f'"{parent}" -> "{node_name}"')
+            if depth > max_depth or node in path:
+                continue
+            path.append(node)
             
-            for child in t['children']:
-                traverse(child, node_name)
-        
-        traverse(tree)
-        
-        graphviz_code = [
-            "digraph DependencyTree {",
-            "    rankdir=TB;",
-            "    node [shape=box, style=filled, fillcolor=lightblue];",
-            "    edge [arrowhead=vee];",
-            ""
-        ]
-        
-        # Добавляем узлы
-        for node in nodes:
-            graphviz_code.append(f'    "{node}" [label="{node.replace("_", "-")}"];')
+            new_prefix = node_prefix + ("    " if node_is_last else "│   ")
+            
+            # Дети кладутся в обратном порядке, чтобы первый был снят первым
+            kids = children[node] or ()
+            last = len(kids) - 1
+            for i in range(last, -1, -1):
+                stack.append((kids[i], new_prefix, i == last, depth + 1))
         
-        graphviz_code.append("")
+        return "\n".join(lines)
+    
+    def collect_graph(self, package: str, max_depth: int = 10) -> Iterator[Tuple[str, str]]:
+        """Ребра графа зависимостей (пакет, зависимость) до заданной глубины"""
+        return self.iter_tree_edges(self.build_dependency_tree(package, max_depth=max_depth))
+    
+    def iter_tree_edges(self, tree: Dict) -> Iterator[Tuple[str, str]]:
+        """Ребра (пакет, зависимость) дерева, построенного build_dependency_tree"""
+        names = self.names
+        children = self.children
+        max_depth = tree['max_depth']
+        root = tree['root']
+        seen = {root}
+        queue = deque([(root, 0)])
+        
+        while queue:
+            node, depth = queue.popleft()
+            if depth > max_depth:
+                continue
+            
+            name = names[node]
+            for child in children[node] or ():
+                yield name, names[child]
+                if child not in seen:
+                    seen.add(child)
+                    queue.append((child, depth + 1))
+    
+    def generate_graphviz(self, tree: Dict) -> str:
+        """Генерация кода Graphviz по дереву зависимостей"""
+        return self.generate_graphviz_from_edges(self.names[tree['root']], self.iter_tree_edges(tree))
+    
+    def generate_graphviz_from_edges(self, root: str, edges: Iterable[Tuple[str, str]]) -> str:
+        """Генерация кода Graphviz по корневому пакету и ребрам графа"""
+        # Имя пакета -> идентификатор узла (преобразуется один раз на пакет)
+        node_ids = {root: root.translate(_DOT_ID_TABLE)}
+        edge_ids = set()
+        
+        for parent, child in edges:
+            parent_id = node_ids.get(parent)
+            if parent_id is None:
+                parent_id = node_ids[parent] = parent.translate(_DOT_ID_TABLE)
+            child_id = node_ids.get(child)
+            if child_id is None:
+                child_id = node_ids[child] = child.translate(_DOT_ID_TABLE)
+            edge_ids.add((parent_id, child_id))
+        
+        buf = io.StringIO()
+        write = buf.write
+        write("digraph DependencyTree {\n"
+              "    rankdir=TB;\n"
+              "    node [shape=box, style=filled, fillcolor=lightblue];\n"
+              "    edge [arrowhead=vee];\n"
+              "\n")
+        
+        # Добавляем узлы: метка - исходное имя пакета
+        for name, node_id in node_ids.items():
+            write('    "')
+            write(node_id)
+            write('" [label="')
+            write(name)
+            write('"];\n')
+        
+        write("\n")
         
         # Добавляем ребра
-        for edge in edges:
-            graphviz_code.append(f"    {edge};")
+        for parent, child in edge_ids:
+            write('    "')
+            write(parent)
+            write('" -> "')
+            write(child)
+            write('";\n')
         
-        graphviz_code.append("}")
+        write("}")
         
-        return "\n".join(graphviz_code)
+        return buf.getvalue()
 
 
 class DependencyVisualizer:
@@ -228,60 +513,8 @@ class DependencyVisualizer:
         
     def parse_arguments(self) -> Dict[str, Any]:
         """Парсинг аргументов командной строки"""
-        parser = argparse.ArgumentParser(
-            description='Визуализатор графа зависимостей пакетов Alpine Linux',
-            formatter_class=argparse.RawDescriptionHelpFormatter
-        )
-        
-        parser.add_argument(
-            '--package',
-            type=str,
-            required=True,
-            help='Имя анализируемого пакета'
-        )
-        
-        parser.add_argument(
-            '--repository',
-            type=str,
-            required=True,
-            help='URL-адрес репозитория или путь к файлу тестового репозитория'
-        )
-        
-        parser.add_argument(
-            '--test-mode',
-            action='store_true',
-            help='Режим работы с тестового репозитория'
-        )
-        
-        parser.add_argument(
-            '--version',
-            type=str,
-            default='latest',
-            help='Версия пакета (по умолчанию: latest)'
-        )
-        
-        parser.add_argument(
-            '--ascii-tree',
-            action='store_true',
-            help='Режим вывода зависимостей в формате ASCII-дерева'
-        )
-        
-        parser.add_argument(
-            '--filter',
-            type=str,
-            default='',
-            help='Подстрока для фильтрации пакетов'
-        )
-        
-        parser.add_argument(
-            '--max-depth',
-            type=int,
-            default=3,
-            help='Максимальная глубина рекурсии для построения дерева'
-        )
-        
         try:
-            args = parser.parse_args()
+            args = _PARSER.parse_args()
             return vars(args)
         except SystemExit:
             print("Ошибка: Неправильные аргументы командной строки")
@@ -297,8 +530,14 @@ class DependencyVisualizer:
         if not config['repository']:
             errors.append("Репозиторий должен быть указан")
         elif config['test_mode']:
-            if not os.path.exists(config['repository']):
+            # Один вызов stat и на проверку существования, и на тип файла
+            try:
+                st = os.stat(config['repository'])
+            except OSError:
                 errors.append(f"Файл репозитория не найден: {config['repository']}")
+            else:
+                if not stat.S_ISREG(st.st_mode):
+                    errors.append(f"Репозиторий не является файлом: {config['repository']}")
         
         if config['version'] and not isinstance(config['version'], str):
             errors.append("Версия должна быть строкой")
@@ -319,11 +558,10 @@ class DependencyVisualizer:
     
     def print_config(self, config: Dict[str, Any]):
         """Вывод конфигурации в формате ключ-значение"""
-        print("Конфигурация приложения:")
-        print("-" * 30)
-        for key, value in config.items():
-            print(f"{key}: {value}")
-        print("-" * 30)
+        lines = ["Конфигурация приложения:", _CONFIG_SEP]
+        lines.extend(f"{key}: {value}" for key, value in config.items())
+        lines.append(_CONFIG_SEP)
+        print("\n".join(lines))
     
     def run_stage1(self):
         """Запуск первого этапа"""
@@ -358,16 +596,16 @@ class DependencyVisualizer:
             graph_builder = DependencyGraph(collector)
             package_name = self.config['package']
             
-            print(f"Построение дерева зависимостей для {package_name}...")
-            dependency_tree = graph_builder.build_dependency_tree(
-                package_name, 
-                max_depth=self.config['max_depth']
-            )
+            print(f"Построение графа зависимостей для {package_name}...")
             
-            # Генерация Graphviz
+            # Генерация Graphviz: ребра собираются обходом в ширину,
+            # ASCII-дерево затем выводится по тем же массивам графа
             print("\n1. Описание графа на языке Graphviz:")
             print("-" * 50)
-            graphviz_code = graph_builder.generate_graphviz(dependency_tree)
+            graphviz_code = graph_builder.generate_graphviz_from_edges(
+                package_name,
+                graph_builder.collect_graph(package_name, max_depth=self.config['max_depth'])
+            )
             print(graphviz_code)
             print("-" * 50)
             
@@ -380,6 +618,10 @@ class DependencyVisualizer:
             if self.config['ascii_tree']:
                 print("\n2. ASCII-дерево зависимостей:")
                 print("-" * 50)
+                dependency_tree = graph_builder.build_dependency_tree(
+                    package_name, 
+                    max_depth=self.config['max_depth']
+                )
                 ascii_tree = graph_builder.generate_ascii_tree(dependency_tree)
                 print(ascii_tree)
                 print("-" * 50)
@@ -402,10 +644,12 @@ class DependencyVisualizer:
             "python3"
         ]
         
+        # Один построитель на все пакеты: зависимости каждого пакета загружаются один раз
+        graph_builder = DependencyGraph(collector)
+        
         for pkg in test_packages:
             print(f"\n--- Пакет: {pkg} ---")
             try:
-                graph_builder = DependencyGraph(collector)
                 tree = graph_builder.build_dependency_tree(pkg, max_depth=2)
                 
                 # Простая статистика